@@ -0,0 +1,23 @@
+# example code to report the progress in processed bytes instead of iterations
+
+import numba as nb
+import numpy as np
+from numba_progress import ProgressBar, monotonic
+
+
+@nb.njit(nogil=True)
+def numba_checksum(data, chunk_size, progress_hook):
+    start = monotonic()
+    checksum = 0
+    for i in range(0, data.shape[0], chunk_size):
+        chunk = data[i:i + chunk_size]
+        checksum ^= chunk.sum()
+        progress_hook.update(chunk.nbytes)
+    return checksum, monotonic() - start
+
+
+if __name__ == "__main__":
+    data = np.random.randint(0, 255, size=2**28, dtype=np.uint8)
+    with ProgressBar(total=data.nbytes, dtype=np.float64, unit='B', unit_scale=True, ncols=80) as numba_progress:
+        checksum, elapsed = numba_checksum(data, 2**16, numba_progress)
+    print(f"checksum {checksum} computed in {elapsed:.2f}s")
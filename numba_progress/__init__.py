@@ -1,2 +1,5 @@
-from .progress import ProgressBar, ProgressBarType
+from .progress import ProgressBar, ProgressBarType, FloatProgressBarType
+from .export import SocketExporter, ProgressCollector
+from .iterators import tracked_range, tracked, tracked_chunks
+from .timing import monotonic, monotonic_ns
 from ._version import __version__
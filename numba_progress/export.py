@@ -0,0 +1,252 @@
+import math
+import operator
+import os
+import random
+import socket
+import struct
+import time
+from collections import deque
+from threading import Thread, Event, Lock
+
+__all__ = ['SocketExporter', 'ProgressCollector', 'BarState']
+
+# Wire format of a single update datagram:
+#   kind (uint8), bar id (uint32), session (uint32), sequence number (uint32), counter value (float64), rate (float64),
+#   total (float64)
+# Every update carries the absolute counter value, so a lost datagram is healed by any later one. The sequence number
+# lets the collector discard datagrams that arrive out of order. The session is chosen randomly by every exporter, so
+# that a restarted job reusing a bar id starts over instead of being discarded as outdated.
+_PACKET = struct.Struct('<BIIIddd')
+_RETIRED_SESSIONS = 8
+_UPDATE = 0
+_CLOSED = 1
+
+
+def _resolve(address, passive=False):
+    """
+    Resolve `address` once into the socket family and the socket address to use. Host names are looked up here, so
+    that sending an update never blocks on a name lookup.
+    """
+    if isinstance(address, (str, bytes, os.PathLike)):
+        return socket.AF_UNIX, os.fspath(address)
+    host, port = address[:2]
+    family, _, _, _, sockaddr = socket.getaddrinfo(host, port, type=socket.SOCK_DGRAM,
+                                                   flags=socket.AI_PASSIVE if passive else 0)[0]
+    return family, sockaddr
+
+
+class SocketExporter(object):
+    """
+    Pushes compact progress updates of a `ProgressBar` to a `ProgressCollector` over a UDP or Unix datagram
+    socket. The updates are sent from the updater thread of the progress bar at its tick rate.
+
+    The socket is non-blocking and every update carries the absolute counter value. If the receiver is slow, not
+    reachable or drops a datagram, the missed progress is contained in the next update, so exporting never stalls
+    the progress bar.
+
+    The progress bar only sends the final update to the exporter when it is closed. The socket is owned by the caller,
+    so the exporter can be reused and has to be closed explicitly (or used as a context manager).
+
+    Parameters
+    ----------
+    address: tuple or str
+        The address of the collector. A (host, port) tuple uses UDP, a path uses a Unix datagram socket. The host is
+        resolved once when the exporter is created (IPv4 or IPv6), so updates never wait for a name lookup.
+    bar_id: int, optional
+        32-bit unsigned identifier of the progress bar at the collector. By default a random id is chosen. A new exporter
+        reusing the id of a previous one (e.g. a restarted job) replaces its state at the collector.
+    resend_interval: float, optional
+        The interval in seconds after which an unchanged counter value is sent again, so that a collector also
+        recovers from a lost datagram while the progress is stalled [default: 1.0].
+    """
+    def __init__(self, address, bar_id=None, resend_interval=1.0):
+        if bar_id is None:
+            bar_id = random.getrandbits(32)
+        bar_id = operator.index(bar_id)
+        if not 0 <= bar_id < 2**32:
+            raise ValueError(f"bar_id must be an integer in [0, 2**32), got {bar_id!r}")
+        self.address = address
+        self.bar_id = bar_id
+        self.resend_interval = resend_interval
+        family, self._sockaddr = _resolve(address)
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._session = random.getrandbits(32)
+        self._sequence = 0
+        self._last_value = None
+        self._last_time = None
+
+    def _send(self, kind, n, rate, total):
+        self._sequence = (self._sequence + 1) % 2**32
+        packet = _PACKET.pack(kind, self.bar_id, self._session, self._sequence, n, rate,
+                              math.nan if total is None else float(total))
+        try:
+            self._socket.sendto(packet, self._sockaddr)
+        except OSError:
+            # receiver is slow or gone: the progress is contained in the next update
+            return False
+        return True
+
+    def export(self, n, total=None):
+        """
+        Send the current counter value `n` unless it did not change since the last update and the last update is
+        more recent than `resend_interval`. Returns True if an update was sent.
+        """
+        n = float(n)
+        now = time.monotonic()
+        if self._last_value is None:
+            rate = 0.0
+        elif n != self._last_value:
+            rate = (n - self._last_value) / (now - self._last_time) if now > self._last_time else 0.0
+        elif now - self._last_time >= self.resend_interval:
+            rate = 0.0
+        else:
+            return False
+        if not self._send(_UPDATE, n, rate, total):
+            return False
+        self._last_value = n
+        self._last_time = now
+        return True
+
+    def finish(self, n, total=None, repeats=3, attempts=10, retry_interval=0.01):
+        """
+        Send the final counter value `n` and mark the progress bar as closed at the collector.
+        The final update is sent `repeats` times to guard against lost datagrams. Failed sends are retried, waiting
+        at most `attempts * retry_interval` seconds in total. Returns True if the final update was sent at least once.
+        """
+        sent = 0
+        for _ in range(attempts):
+            if self._send(_CLOSED, float(n), 0.0, total):
+                sent += 1
+                if sent == repeats:
+                    break
+            else:
+                time.sleep(retry_interval)
+        return sent > 0
+
+    def close(self):
+        """
+        Close the socket.
+        """
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class BarState(object):
+    """
+    The state of a single remote progress bar as seen by a `ProgressCollector`.
+    """
+    __slots__ = ('n', 'rate', 'total', 'closed', 'last_seen', 'session', 'sequence', 'retired_sessions')
+
+    def __init__(self):
+        self.session = None
+        self.sequence = None
+        self.retired_sessions = deque(maxlen=_RETIRED_SESSIONS)
+        self.n = 0.0
+        self.rate = 0.0
+        self.total = None
+        self.closed = False
+        self.last_seen = None
+
+    def __repr__(self):
+        return f"BarState(n={self.n}, rate={self.rate}, total={self.total}, closed={self.closed})"
+
+
+class ProgressCollector(object):
+    """
+    Receives and aggregates the updates sent by one or many `SocketExporter` instances.
+    It spawns a separate thread that receives the updates in the background.
+
+    Parameters
+    ----------
+    address: tuple or str, optional
+        The address to bind to. A (host, port) tuple uses UDP, a path uses a Unix datagram socket
+        [default: ('127.0.0.1', 0), a free local UDP port].
+    poll_interval: float, optional
+        The timeout in seconds used by the internal thread to check for the exit condition [default: 0.1].
+    """
+    def __init__(self, address=('127.0.0.1', 0), poll_interval=0.1):
+        family, sockaddr = _resolve(address, passive=True)
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.bind(sockaddr)
+        self._socket.settimeout(poll_interval)
+        self.address = self._socket.getsockname()
+        self._bars = {}
+        self._lock = Lock()
+        self._exit_event = Event()
+        self._thread = Thread(target=self._receive_function, daemon=True)
+        self._thread.start()
+
+    @property
+    def bars(self):
+        """A snapshot of the states of all known progress bars keyed by their id."""
+        with self._lock:
+            return dict(self._bars)
+
+    @property
+    def n(self):
+        """The aggregated counter value of all known progress bars."""
+        with self._lock:
+            return sum(bar.n for bar in self._bars.values())
+
+    def _apply(self, data):
+        try:
+            kind, bar_id, session, sequence, n, rate, total = _PACKET.unpack(data)
+        except struct.error:
+            return
+        with self._lock:
+            bar = self._bars.get(bar_id)
+            if bar is None:
+                bar = self._bars[bar_id] = BarState()
+            if session != bar.session:
+                # a new exporter (e.g. a restarted job) took over this bar id, late datagrams of earlier ones are dropped
+                if session in bar.retired_sessions:
+                    return
+                if bar.session is not None:
+                    bar.retired_sessions.append(bar.session)
+                bar.session = session
+                bar.sequence = None
+                bar.total = None
+            # drop duplicated datagrams and those that arrived out of order (modulo wrap around of the sequence number)
+            if bar.sequence is not None and (bar.sequence - sequence) % 2**32 < 2**31:
+                return
+            bar.sequence = sequence
+            bar.n = n
+            bar.rate = rate
+            bar.closed = kind == _CLOSED
+            if not math.isnan(total):
+                bar.total = total
+            bar.last_seen = time.monotonic()
+
+    def _receive_function(self):
+        """Background thread for receiving updates.
+        """
+        while not self._exit_event.is_set():
+            try:
+                data = self._socket.recv(_PACKET.size)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._apply(data)
+
+    def close(self):
+        self._exit_event.set()
+        self._thread.join()
+        self._socket.close()
+        if self._socket.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,274 @@
+import operator
+
+from numba import types
+from numba.core import cgutils, errors
+from numba.core.imputils import lower_builtin, iternext_impl, RefType, impl_ret_new_ref, call_getiter, call_iternext
+from numba.extending import type_callable, models, register_model
+from numba.np.arrayobj import make_array
+
+from .numba_atomic import atomic_rmw
+from .progress import ProgressBarTypeImpl
+
+__all__ = ['tracked_range', 'tracked', 'tracked_chunks']
+
+
+# The helpers below wrap a loop like tqdm wraps an iterable. Instead of updating the progress bar on every element,
+# they only update the atomic counter every `stride` elements (and once more for the remainder when the iteration is
+# exhausted). Within numba functions they compile to a plain counting loop with a single comparison per element, so
+# they are cheaper than calling `progress.update(1)` on every iteration.
+#
+# Caveats: They cannot be used with prange. Unlike tqdm, leaving the loop early (break or return) does not report the
+# elements consumed since the last update, i.e. up to `stride - 1` elements (or the current chunk) are not counted.
+
+
+def _check_positive(name, value):
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value}")
+
+
+def _tracked_python(iterable, progress, stride):
+    pending = 0
+    for item in iterable:
+        yield item
+        pending += 1
+        if pending == stride:
+            progress.update(pending)
+            pending = 0
+    if pending > 0:
+        progress.update(pending)
+
+
+def _tracked_chunks_python(array, chunk, progress):
+    for start in range(0, len(array), chunk):
+        block = array[start:start + chunk]
+        yield block
+        progress.update(len(block))
+
+
+def tracked_range(n, progress, stride=1):
+    """
+    Iterate over `range(n)` like tqdm wrapping an iterable, updating `progress` every `stride` iterations.
+    Leaving the loop early does not report the iterations since the last update.
+    """
+    _check_positive("stride", stride)
+    return _tracked_python(range(n), progress, stride)
+
+
+def tracked(iterable, progress, stride=1):
+    """
+    Iterate over an iterable (e.g. an array, a `numba.typed.List`, a `numba.typed.Dict` or one of its views) like tqdm
+    wrapping an iterable, updating `progress` every `stride` elements.
+    Leaving the loop early does not report the elements since the last update.
+    """
+    _check_positive("stride", stride)
+    return _tracked_python(iterable, progress, stride)
+
+
+def tracked_chunks(array, chunk, progress):
+    """
+    Iterate over `array` in chunks of `chunk` elements along the first axis, updating `progress` with the size of
+    every chunk after it has been processed.
+    Leaving the loop early does not report the current chunk.
+    """
+    _check_positive("chunk", chunk)
+    return _tracked_chunks_python(array, chunk, progress)
+
+
+# Numba Native Implementation of the tracked iterators
+
+class TrackedIteratorType(types.SimpleIteratorType):
+    """
+    Iterator that adds the number of consumed elements to a progress bar hook every `stride` elements.
+    Depending on `kind`, it yields
+        - 'range': the indices `0, 1, ..., stop - 1` (`source` is an integer)
+        - 'items': `source[index]` for an indexable source like an array or a list
+        - 'chunks': `source[index:index + step]` for `index = 0, step, 2 * step, ...`
+        - 'iter': the elements of the iterator of `source` (e.g. a typed Dict or one of its views)
+    """
+    def __init__(self, source, hook, kind, yield_type):
+        self.source = source
+        self.hook = hook
+        self.kind = kind
+        super().__init__(f'tracked_iter({source}, {hook}, {kind})', yield_type)
+
+
+@register_model(TrackedIteratorType)
+class TrackedIteratorModel(models.StructModel):
+    def __init__(self, dmm, fe_type):
+        if fe_type.kind == 'iter':
+            source = ('inner', fe_type.source.iterator_type)
+        else:
+            source = ('source', fe_type.source)
+        members = [
+            source,
+            ('hook', fe_type.hook),
+            ('index', types.EphemeralPointer(types.intp)),
+            ('flushed', types.EphemeralPointer(types.intp)),
+            ('stop', types.intp),
+            ('stride', types.intp),
+            ('step', types.intp),
+        ]
+        models.StructModel.__init__(self, dmm, fe_type, members)
+
+
+def _tracked_iterator_type(typingctx, source, progress, kind):
+    hook = types.Array(progress.dtype, 1, 'C')
+    if kind == 'range':
+        return TrackedIteratorType(types.intp, hook, kind, types.intp)
+    if kind == 'iter':
+        return TrackedIteratorType(source, hook, kind, source.iterator_type.yield_type)
+    index_type = types.slice2_type if kind == 'chunks' else types.intp
+    yield_type = typingctx.resolve_function_type(operator.getitem, (source, index_type), {}).return_type
+    return TrackedIteratorType(source, hook, kind, yield_type)
+
+
+@type_callable(tracked_range)
+def _type_tracked_range(context):
+    def typer(n, progress, stride=None):
+        if isinstance(n, types.Integer) and isinstance(progress, ProgressBarTypeImpl) and \
+                (stride is None or isinstance(stride, types.Integer)):
+            return _tracked_iterator_type(context, n, progress, 'range')
+    return typer
+
+
+@type_callable(tracked)
+def _type_tracked(context):
+    def typer(iterable, progress, stride=None):
+        if not isinstance(progress, ProgressBarTypeImpl) or not (stride is None or isinstance(stride, types.Integer)):
+            return None
+        if isinstance(iterable, (types.Array, types.ListType, types.List)):
+            return _tracked_iterator_type(context, iterable, progress, 'items')
+        if isinstance(iterable, types.IterableType):
+            return _tracked_iterator_type(context, iterable, progress, 'iter')
+        raise errors.TypingError(f"tracked() requires an iterable, got {iterable}")
+    return typer
+
+
+@type_callable(tracked_chunks)
+def _type_tracked_chunks(context):
+    def typer(array, chunk, progress):
+        if isinstance(array, types.Array) and isinstance(chunk, types.Integer) and \
+                isinstance(progress, ProgressBarTypeImpl):
+            return _tracked_iterator_type(context, array, progress, 'chunks')
+    return typer
+
+
+def _make_tracked(context, builder, iterator_type, source_type, source, progress_type, progress, stride, step,
+                  name):
+    """
+    Build a tracked iterator in the frame of the calling function, like numba does for enumerate or zip.
+    """
+    with cgutils.if_unlikely(builder, builder.icmp_signed('<', stride, stride.type(1))):
+        context.call_conv.return_user_exc(builder, ValueError, (f"{name} must be at least 1",))
+
+    iterator = context.make_helper(builder, iterator_type)
+    zero = context.get_constant(types.intp, 0)
+    if iterator_type.kind == 'iter':
+        # the number of elements is not known in advance, the exhaustion of the inner iterator ends the iteration
+        iterator.inner = call_getiter(context, builder, source_type, source)
+        iterator.stop = zero
+    else:
+        if iterator_type.kind == 'range':
+            stop = builder.select(builder.icmp_signed('<', source, source.type(0)), source.type(0), source)
+        else:
+            stop = context.compile_internal(builder, lambda s: len(s), types.intp(source_type), [source])
+        iterator.source = source
+        iterator.stop = stop
+        context.nrt.incref(builder, iterator_type.source, source)
+    iterator.hook = cgutils.create_struct_proxy(progress_type)(context, builder, value=progress).hook
+    iterator.index = cgutils.alloca_once_value(builder, zero)
+    iterator.flushed = cgutils.alloca_once_value(builder, zero)
+    iterator.stride = stride
+    iterator.step = step
+    context.nrt.incref(builder, iterator_type.hook, iterator.hook)
+    return impl_ret_new_ref(context, builder, iterator_type, iterator._getvalue())
+
+
+@lower_builtin(tracked_range, types.Integer, ProgressBarTypeImpl)
+@lower_builtin(tracked_range, types.Integer, ProgressBarTypeImpl, types.Integer)
+def _lower_tracked_range(context, builder, sig, args):
+    stride = context.cast(builder, args[2], sig.args[2], types.intp) if len(args) > 2 \
+        else context.get_constant(types.intp, 1)
+    n = context.cast(builder, args[0], sig.args[0], types.intp)
+    return _make_tracked(context, builder, sig.return_type, types.intp, n, sig.args[1], args[1], stride,
+                         context.get_constant(types.intp, 1), "stride")
+
+
+@lower_builtin(tracked, types.Any, ProgressBarTypeImpl)
+@lower_builtin(tracked, types.Any, ProgressBarTypeImpl, types.Integer)
+def _lower_tracked(context, builder, sig, args):
+    stride = context.cast(builder, args[2], sig.args[2], types.intp) if len(args) > 2 \
+        else context.get_constant(types.intp, 1)
+    return _make_tracked(context, builder, sig.return_type, sig.args[0], args[0], sig.args[1], args[1], stride,
+                         context.get_constant(types.intp, 1), "stride")
+
+
+@lower_builtin(tracked_chunks, types.Array, types.Integer, ProgressBarTypeImpl)
+def _lower_tracked_chunks(context, builder, sig, args):
+    chunk = context.cast(builder, args[1], sig.args[1], types.intp)
+    return _make_tracked(context, builder, sig.return_type, sig.args[0], args[0], sig.args[2], args[2], chunk, chunk,
+                         "chunk")
+
+
+def _flush(context, builder, iterator_type, iterator, pending):
+    """Atomically add `pending` to the progress bar hook."""
+    hook_type = iterator_type.hook
+    op = 'fadd' if isinstance(hook_type.dtype, types.Float) else 'add'
+    value = context.cast(builder, pending, types.intp, hook_type.dtype)
+    atomic_rmw(context, builder, op, hook_type, value, make_array(hook_type)(context, builder, iterator.hook).data)
+
+
+def _flush_batch(context, builder, iterator_type, iterator, index, flushed):
+    """Flush the elements before `index` that have been consumed by the loop body once a batch is complete."""
+    pending = builder.sub(index, flushed)
+    with cgutils.if_unlikely(builder, builder.icmp_signed('>=', pending, iterator.stride)):
+        _flush(context, builder, iterator_type, iterator, pending)
+        builder.store(index, iterator.flushed)
+
+
+def _flush_remainder(context, builder, iterator_type, iterator, stop, flushed):
+    """Flush the remainder once the iteration is exhausted."""
+    pending = builder.sub(stop, flushed)
+    with cgutils.if_unlikely(builder, builder.icmp_signed('>', pending, pending.type(0))):
+        _flush(context, builder, iterator_type, iterator, pending)
+        builder.store(stop, iterator.flushed)
+
+
+@lower_builtin('iternext', TrackedIteratorType)
+@iternext_impl(RefType.NEW)
+def _iternext_tracked(context, builder, sig, args, result):
+    [iterator_type] = sig.args
+    [iterator_value] = args
+    iterator = context.make_helper(builder, iterator_type, value=iterator_value)
+    kind = iterator_type.kind
+
+    index = builder.load(iterator.index)
+    flushed = builder.load(iterator.flushed)
+    if kind == 'iter':
+        inner_result = call_iternext(context, builder, iterator_type.source.iterator_type, iterator.inner)
+        is_valid = inner_result.is_valid()
+    else:
+        is_valid = builder.icmp_signed('<', index, iterator.stop)
+    result.set_valid(is_valid)
+
+    with builder.if_else(is_valid, likely=True) as (then, otherwise):
+        with then:
+            _flush_batch(context, builder, iterator_type, iterator, index, flushed)
+            source = iterator_type.source
+            if kind == 'range':
+                value = index
+            elif kind == 'iter':
+                value = inner_result.yielded_value()
+            elif kind == 'chunks':
+                value = context.compile_internal(builder, lambda a, i, step: a[i:i + step],
+                                                 iterator_type.yield_type(source, types.intp, types.intp),
+                                                 [iterator.source, index, iterator.step])
+            else:
+                value = context.compile_internal(builder, lambda s, i: s[i],
+                                                 iterator_type.yield_type(source, types.intp),
+                                                 [iterator.source, index])
+            result.yield_(value)
+            builder.store(builder.add(index, iterator.step), iterator.index)
+        with otherwise:
+            stop = index if kind == 'iter' else iterator.stop
+            _flush_remainder(context, builder, iterator_type, iterator, stop, flushed)
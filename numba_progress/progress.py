@@ -1,10 +1,12 @@
 import numba as nb
 import numpy as np
 import sys
+import time
+import warnings
 from tqdm import tqdm
 from tqdm.notebook import tqdm as tqdm_notebook
 
-from threading import Thread, Event
+from threading import Thread, Event, Lock
 
 from numba.extending import overload_method, typeof_impl, as_numba_type, models, register_model, \
     make_attribute_wrapper, overload_attribute, unbox, NativeValue, box, lower_getattr, lower_setattr
@@ -14,6 +16,9 @@ from numba.core import cgutils
 from numba.core.boxing import unbox_array
 
 
+_supported_dtypes = (np.dtype(np.uint64), np.dtype(np.float64))
+
+
 def is_notebook():
     """Determine if we're running within an IPython kernel
 
@@ -29,6 +34,70 @@ def is_notebook():
     return getattr(get_ipython(), "kernel", None) is not None
 
 
+class _CallbackWorker(object):
+    """
+    Runs a single progress callback in its own thread, so that a slow callback cannot stall the updater thread of the
+    progress bar. Updates posted while the callback is still running are coalesced into the next invocation.
+    """
+    def __init__(self, callback, interval):
+        self.callback = callback
+        self.interval = interval
+        self._pending = None
+        self._last_value = 0
+        self._last_call = None
+        self._lock = Lock()
+        self._posted = Event()
+        self._closed = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def post(self, n, elapsed):
+        with self._lock:
+            self._pending = (n, elapsed)
+        self._posted.set()
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, None
+            self._posted.clear()
+            return pending
+
+    def _call(self, n, elapsed):
+        delta, self._last_value = n - self._last_value, n
+        self._last_call = time.monotonic()
+        try:
+            self.callback(n, delta, elapsed)
+        except Exception as e:
+            warnings.warn(f"Progress callback {self.callback!r} raised {e!r}", RuntimeWarning)
+
+    def _run(self):
+        while True:
+            self._posted.wait()
+            if self._closed.is_set():
+                break
+            if self._last_call is not None:
+                remaining = self._last_call + self.interval - time.monotonic()
+                if remaining > 0 and self._closed.wait(remaining):
+                    break
+            pending = self._take()
+            if pending is not None:
+                self._call(*pending)
+        pending = self._take()
+        if pending is not None:
+            self._call(*pending)  # the final update is never throttled
+
+    def close(self, n, elapsed):
+        """Post the final update and signal the thread to exit after invoking the callback with it."""
+        self.post(n, elapsed)
+        self._closed.set()
+        self._posted.set()  # wake up the thread in case it already consumed the final update
+
+    def join(self, timeout):
+        """Wait for the thread to exit and return False if it is still running after `timeout` seconds."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
 class ProgressBar(object):
     """
     Wraps the tqdm progress bar enabling it to be updated from within a numba nopython function.
@@ -59,24 +128,62 @@ class ProgressBar(object):
             - file is redefined above (see above)
             - iterable is not available because it would not make sense here
             - dynamic_ncols is defined above
+    dtype: numpy dtype, optional
+        The dtype of the internal counter. Either `np.uint64` to count iterations [default] or `np.float64` to count
+        fractional work units like processed bytes or FLOPs. Combine the latter with e.g. `unit='B', unit_scale=True`
+        to display the throughput in real units.
+    exporter: `numba_progress.SocketExporter`, optional
+        If set, the internal thread additionally pushes the progress to the exporter on every update, e.g. to stream it
+        to a `numba_progress.ProgressCollector` on another process or node. On close, only the final update is sent;
+        the exporter itself is not closed, as it is owned by the caller.
+    callbacks: list, optional
+        Callables invoked as `callback(n, delta, elapsed)` with the current counter value, the change since the
+        previous invocation of this callback and the elapsed time in seconds. Every callback runs on a dedicated worker
+        thread. The internal thread only hands the latest value to the workers on every update, so a slow callback
+        cannot delay the progress bar or other callbacks; values posted while it is still running are coalesced and it
+        receives only the most recent one. An entry can also be a tuple `(callback, interval)` to throttle the callback
+        to at most one call per `interval` seconds [default: update_interval]. All callbacks receive the final value
+        on close.
+    render: bool, optional
+        If false, no tqdm progress bar is created and the progress is only reported to the exporter and the
+        callbacks [default: True].
+    close_timeout: float, optional
+        The time in seconds to wait on close for the callbacks to process the final value [default: 1.0]. Callbacks
+        still running afterwards are left behind in their (daemon) threads with a warning.
     """
-    def __init__(self, file=None, update_interval=0.1, notebook=None, dynamic_ncols=True, **kwargs):
+    def __init__(self, file=None, update_interval=0.1, notebook=None, dynamic_ncols=True, dtype=np.uint64,
+                 exporter=None, callbacks=None, render=True, close_timeout=1.0, **kwargs):
         if file is None:
             file = sys.stdout
+        dtype = np.dtype(dtype)
+        if dtype not in _supported_dtypes:
+            raise ValueError(f"Unsupported counter dtype {dtype}. Use one of "
+                             f"{', '.join(str(d) for d in _supported_dtypes)}.")
         self._last_value = 0
 
+        self.total = kwargs.get('total')
+
         if notebook is None:
             notebook = is_notebook()
 
-        if notebook:
+        if not render:
+            self._tqdm = None
+        elif notebook:
             self._tqdm = tqdm_notebook(iterable=None, dynamic_ncols=dynamic_ncols, file=file, **kwargs)
         else:
             self._tqdm = tqdm(iterable=None, dynamic_ncols=dynamic_ncols, file=file, **kwargs)
 
-        self.hook = np.zeros(1, dtype=np.uint64)
+        self.hook = np.zeros(1, dtype=dtype)
         self._updater_thread = None
         self._exit_event = Event()
+        self._exporter = exporter
         self.update_interval = update_interval
+        self.close_timeout = close_timeout
+        self._callbacks = []
+        for callback in callbacks or ():
+            callback, interval = callback if isinstance(callback, tuple) else (callback, update_interval)
+            self._callbacks.append(_CallbackWorker(callback, interval))
+        self._start_time = time.monotonic()
         self._start()
 
     def _start(self):
@@ -87,8 +194,23 @@ class ProgressBar(object):
         self._exit_event.set()
         self._timer.join()
         self._update_tqdm()  # update to set the progressbar to it's final value in case the thread missed a loop
-        self._tqdm.refresh()
-        self._tqdm.close()
+        if self._tqdm is not None:
+            self._tqdm.refresh()
+            self._tqdm.close()
+        if self._exporter is not None:
+            try:
+                self._exporter.finish(self.hook[0], self.total)
+            except Exception as e:
+                warnings.warn(f"Progress exporter {self._exporter!r} raised {e!r}", RuntimeWarning)
+        value = self.hook[0].item()
+        elapsed = time.monotonic() - self._start_time
+        for callback in self._callbacks:
+            callback.close(value, elapsed)
+        deadline = time.monotonic() + self.close_timeout
+        for callback in self._callbacks:
+            if not callback.join(max(deadline - time.monotonic(), 0.0)):
+                warnings.warn(f"Progress callback {callback.callback!r} did not finish within "
+                              f"{self.close_timeout}s after close", RuntimeWarning)
 
     @property
     def n(self):
@@ -103,6 +225,8 @@ class ProgressBar(object):
         self._update_tqdm()
 
     def _update_tqdm(self):
+        if self._tqdm is None:
+            return
         value = self.hook[0]
         #diff = value - self._last_value
         #self._last_value = value
@@ -115,6 +239,16 @@ class ProgressBar(object):
         """
         while not self._exit_event.is_set():
             self._update_tqdm()
+            if self._exporter is not None:
+                try:
+                    self._exporter.export(self.hook[0], self.total)
+                except Exception as e:
+                    warnings.warn(f"Progress exporter {self._exporter!r} raised {e!r}", RuntimeWarning)
+            if self._callbacks:
+                value = self.hook[0].item()
+                elapsed = time.monotonic() - self._start_time
+                for callback in self._callbacks:
+                    callback.post(value, elapsed)
             self._exit_event.wait(self.update_interval)
 
     def __enter__(self):
@@ -127,16 +261,22 @@ class ProgressBar(object):
 # Numba Native Implementation for the ProgressBar Class
 
 class ProgressBarTypeImpl(types.Type):
-    def __init__(self):
-        super().__init__(name='ProgressBar')
+    def __init__(self, dtype=types.uint64):
+        self.dtype = dtype
+        name = 'ProgressBar' if dtype == types.uint64 else f'ProgressBar[{dtype}]'
+        super().__init__(name=name)
 
 
 # This is the numba type representation of the ProgressBar class to be used in signatures
 ProgressBarType = ProgressBarTypeImpl()
+# numba type representation of a ProgressBar counting float64 work units (dtype=np.float64)
+FloatProgressBarType = ProgressBarTypeImpl(types.float64)
 
 
 @typeof_impl.register(ProgressBar)
 def typeof_index(val, c):
+    if val.hook.dtype == np.float64:
+        return FloatProgressBarType
     return ProgressBarType
 
 
@@ -147,7 +287,7 @@ as_numba_type.register(ProgressBar, ProgressBarType)
 class ProgressBarModel(models.StructModel):
     def __init__(self, dmm, fe_type):
         members = [
-            ('hook', types.Array(types.uint64, 1, 'C')),
+            ('hook', types.Array(fe_type.dtype, 1, 'C')),
         ]
         models.StructModel.__init__(self, dmm, fe_type, members)
 
@@ -171,7 +311,7 @@ def unbox_progressbar(typ, obj, c):
     """
     hook_obj = c.pyapi.object_getattr_string(obj, 'hook')
     progress_bar = cgutils.create_struct_proxy(typ)(c.context, c.builder)
-    progress_bar.hook = unbox_array(types.Array(types.uint64, 1, 'C'), hook_obj, c).value
+    progress_bar.hook = unbox_array(types.Array(typ.dtype, 1, 'C'), hook_obj, c).value
     c.pyapi.decref(hook_obj)
     is_error = cgutils.is_not_null(c.builder, c.pyapi.err_occurred())
     return NativeValue(progress_bar._getvalue(), is_error=is_error)
@@ -0,0 +1,84 @@
+import ctypes
+import time
+
+from llvmlite import ir
+import llvmlite.binding as ll
+from numba import types
+from numba.core import cgutils, errors
+from numba.extending import intrinsic, overload
+
+__all__ = ['monotonic', 'monotonic_ns']
+
+
+def _register_clock_gettime():
+    """Make libc's clock_gettime resolvable from numba compiled code.
+    """
+    libc = ctypes.CDLL(None)
+    address = ctypes.cast(libc.clock_gettime, ctypes.c_void_p).value
+    ll.add_symbol('clock_gettime', address)
+
+
+_has_monotonic_clock = hasattr(time, 'CLOCK_MONOTONIC')
+if _has_monotonic_clock:
+    _register_clock_gettime()
+
+
+@intrinsic
+def _monotonic_ns(typingctx):
+    """
+    Reads CLOCK_MONOTONIC through clock_gettime and returns the time in nanoseconds.
+    """
+    if not _has_monotonic_clock:
+        raise errors.TypingError("clock_gettime(CLOCK_MONOTONIC) is not available on this platform")
+
+    sig = types.int64()
+
+    def codegen(context, builder, signature, args):
+        long_t = ir.IntType(ctypes.sizeof(ctypes.c_long) * 8)
+        int_t = ir.IntType(ctypes.sizeof(ctypes.c_int) * 8)
+        i64 = ir.IntType(64)
+        timespec_t = ir.LiteralStructType([long_t, long_t])
+        fnty = ir.FunctionType(int_t, [int_t, timespec_t.as_pointer()])
+        fn = cgutils.get_or_insert_function(builder.module, fnty, 'clock_gettime')
+
+        ts = cgutils.alloca_once(builder, timespec_t)
+        builder.call(fn, [int_t(time.CLOCK_MONOTONIC), ts])
+        sec = builder.sext(builder.load(cgutils.gep_inbounds(builder, ts, 0, 0)), i64)
+        nsec = builder.sext(builder.load(cgutils.gep_inbounds(builder, ts, 0, 1)), i64)
+        return builder.add(builder.mul(sec, i64(1_000_000_000)), nsec)
+
+    return sig, codegen
+
+
+def monotonic_ns():
+    """
+    Return the value of a monotonic clock in nanoseconds.
+
+    This can be called from python as well as from numba nopython functions and reads the same clock as
+    `time.monotonic_ns`, so timestamps taken inside and outside of numba code are comparable.
+    """
+    return time.monotonic_ns()
+
+
+def monotonic():
+    """
+    Return the value of a monotonic clock in fractional seconds.
+
+    This can be called from python as well as from numba nopython functions and reads the same clock as
+    `time.monotonic`, so timestamps taken inside and outside of numba code are comparable.
+    """
+    return time.monotonic()
+
+
+@overload(monotonic_ns, jit_options={"nogil": True}, inline='always')
+def _ol_monotonic_ns():
+    def monotonic_ns_impl():
+        return _monotonic_ns()
+    return monotonic_ns_impl
+
+
+@overload(monotonic, jit_options={"nogil": True}, inline='always')
+def _ol_monotonic():
+    def monotonic_impl():
+        return _monotonic_ns() / 1e9
+    return monotonic_impl
@@ -0,0 +1,224 @@
+import io
+import os
+import socket
+import struct
+import time
+
+import pytest
+from numba import njit, prange
+
+from numba_progress import ProgressBar, SocketExporter, ProgressCollector
+
+
+@njit(nogil=True, parallel=True)
+def _numba_parallel(progress, n):
+    for i in prange(n):
+        progress.update(1)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+_PACKET = struct.Struct('<BIIIddd')
+
+
+def _drain(receiver):
+    packets = []
+    while True:
+        try:
+            packets.append(_PACKET.unpack(receiver.recv(64)))
+        except BlockingIOError:
+            return packets
+
+
+class TestSocketExporter:
+
+    def test_absolute_updates(self):
+        with ProgressCollector() as collector, SocketExporter(collector.address, bar_id=7) as exporter:
+            assert exporter.export(5, total=100)
+            assert exporter.export(8, total=100)
+            assert not exporter.export(8, total=100)  # unchanged values are not sent
+            assert _wait_for(lambda: collector.bars.get(7) is not None and collector.bars[7].n == 8)
+            bar = collector.bars[7]
+            assert bar.total == 100
+            assert not bar.closed
+            assert exporter.finish(10, total=100)
+            assert _wait_for(lambda: collector.bars[7].closed)
+            assert collector.bars[7].n == 10
+
+    def test_unchanged_value_is_resent(self):
+        with ProgressCollector() as collector, SocketExporter(collector.address, resend_interval=0.0) as exporter:
+            assert exporter.export(3)
+            assert exporter.export(3)
+
+    @pytest.mark.parametrize("bar_id", [-1, 2**32, 1.5])
+    def test_invalid_bar_id(self, bar_id):
+        with pytest.raises((ValueError, TypeError)):
+            SocketExporter(("127.0.0.1", 9), bar_id=bar_id)
+
+    def test_unreachable_receiver_does_not_raise(self, tmp_path):
+        with SocketExporter(str(tmp_path / "missing.sock"), bar_id=1) as exporter:
+            assert not exporter.export(1)
+            assert not exporter.finish(1, attempts=2, retry_interval=0.0)
+
+    def test_slow_receiver_coalesces(self, tmp_path):
+        path = str(tmp_path / "slow.sock")
+        receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        receiver.bind(path)
+        receiver.setblocking(False)
+        try:
+            with SocketExporter(path, bar_id=3) as exporter:
+                value = 0
+                start = time.monotonic()
+                while exporter.export(value + 1):
+                    value += 1
+                    assert time.monotonic() - start < 10.0
+                # the receive queue is full now, further updates are dropped without blocking
+                assert not exporter.export(value + 100)
+                # once the receiver catches up, the next update contains all missed progress
+                assert len(_drain(receiver)) == value
+                assert exporter.export(value + 200)
+                assert _drain(receiver)[-1][4] == value + 200
+        finally:
+            receiver.close()
+            os.unlink(path)
+
+    def test_udp_loss_is_healed(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1024)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.setblocking(False)
+        try:
+            with SocketExporter(receiver.getsockname(), bar_id=5) as exporter:
+                for i in range(1, 201):
+                    assert exporter.export(i)
+                received = _drain(receiver)
+                assert len(received) < 200  # the receiver dropped datagrams
+                # every received datagram carries the absolute value, so the next one heals the loss
+                assert exporter.export(201)
+                kind, bar_id, session, sequence, n, rate, total = _drain(receiver)[-1]
+                assert n == 201
+                assert sequence > max(packet[3] for packet in received)
+        finally:
+            receiver.close()
+
+    def test_out_of_order_datagrams_are_dropped(self):
+        with ProgressCollector() as collector:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                sender.sendto(_PACKET.pack(0, 9, 1, 5, 50.0, 0.0, float("nan")), collector.address)
+                sender.sendto(_PACKET.pack(1, 9, 1, 4, 40.0, 0.0, 999.0), collector.address)
+                sender.sendto(_PACKET.pack(0, 9, 1, 6, 60.0, 0.0, float("nan")), collector.address)
+            finally:
+                sender.close()
+            assert _wait_for(lambda: 9 in collector.bars and collector.bars[9].n == 60)
+            bar = collector.bars[9]
+            assert bar.total is None
+            assert not bar.closed
+
+    def test_restart_with_same_bar_id(self):
+        with ProgressCollector() as collector:
+            with SocketExporter(collector.address, bar_id=3) as exporter:
+                for i in range(1, 51):
+                    exporter.export(i)
+                exporter.finish(50)
+            assert _wait_for(lambda: 3 in collector.bars and collector.bars[3].closed)
+            with SocketExporter(collector.address, bar_id=3) as exporter:
+                assert exporter.export(5)
+                assert _wait_for(lambda: collector.bars[3].n == 5)
+                assert not collector.bars[3].closed
+                assert exporter.finish(7)
+            assert _wait_for(lambda: collector.bars[3].closed and collector.bars[3].n == 7)
+
+    def test_late_datagrams_of_previous_session_are_dropped(self):
+        with ProgressCollector() as collector:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                sender.sendto(_PACKET.pack(0, 4, 1, 10, 10.0, 0.0, float("nan")), collector.address)
+                sender.sendto(_PACKET.pack(0, 4, 2, 1, 1.0, 0.0, float("nan")), collector.address)
+                sender.sendto(_PACKET.pack(0, 4, 1, 11, 11.0, 0.0, float("nan")), collector.address)
+                sender.sendto(_PACKET.pack(0, 4, 2, 2, 2.0, 0.0, float("nan")), collector.address)
+            finally:
+                sender.close()
+            assert _wait_for(lambda: 4 in collector.bars and collector.bars[4].sequence == 2)
+            assert collector.bars[4].n == 2.0
+
+    def test_host_name_is_resolved(self):
+        with ProgressCollector(("localhost", 0)) as collector:
+            with SocketExporter(("localhost", collector.address[1]), bar_id=2) as exporter:
+                assert exporter.export(4)
+            assert _wait_for(lambda: 2 in collector.bars and collector.bars[2].n == 4)
+
+    @pytest.mark.skipif(not socket.has_ipv6, reason="requires IPv6")
+    def test_ipv6(self):
+        try:
+            collector = ProgressCollector(("::1", 0))
+        except OSError:
+            pytest.skip("IPv6 loopback is not available")
+        with collector, SocketExporter(collector.address, bar_id=6) as exporter:
+            assert exporter.export(3)
+            assert _wait_for(lambda: 6 in collector.bars and collector.bars[6].n == 3)
+
+    def test_aggregation(self):
+        with ProgressCollector() as collector:
+            for i in range(3):
+                with SocketExporter(collector.address, bar_id=i) as exporter:
+                    exporter.finish(i + 1)
+            assert _wait_for(lambda: len(collector.bars) == 3)
+            assert collector.n == 6
+
+
+class _FailingExporter(object):
+
+    def export(self, n, total=None):
+        raise RuntimeError("export failed")
+
+    def finish(self, n, total=None):
+        raise RuntimeError("finish failed")
+
+
+class TestProgressBarExport:
+
+    def test_progressbar_streams_to_collector(self):
+        with ProgressCollector() as collector, SocketExporter(collector.address, bar_id=42) as exporter:
+            with ProgressBar(total=100, file=io.StringIO(), update_interval=0.01, exporter=exporter) as p:
+                _numba_parallel(p, 100)
+            assert _wait_for(lambda: 42 in collector.bars and collector.bars[42].closed)
+            bar = collector.bars[42]
+            assert bar.n == 100
+            assert bar.total == 100
+
+    def test_progressbar_does_not_close_exporter(self):
+        with ProgressCollector() as collector, SocketExporter(collector.address, bar_id=1) as exporter:
+            for total in (10, 20):
+                with ProgressBar(total=total, file=io.StringIO(), exporter=exporter) as p:
+                    p.update(total)
+                assert _wait_for(lambda: collector.bars.get(1) is not None and collector.bars[1].n == total)
+                assert _wait_for(lambda: collector.bars[1].closed)
+
+    def test_failing_exporter_does_not_stall(self):
+        buf = io.StringIO()
+        calls = []
+        with pytest.warns(RuntimeWarning, match="failed"):
+            with ProgressBar(total=10, file=buf, update_interval=0.01, exporter=_FailingExporter(),
+                             callbacks=[lambda n, delta, elapsed: calls.append(n)]) as p:
+                time.sleep(0.05)
+                p.update(10)
+                time.sleep(0.05)
+        assert "100%" in buf.getvalue()
+        assert calls[-1] == 10
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires unix sockets")
+    def test_progressbar_streams_over_unix_socket(self, tmp_path):
+        with ProgressCollector(str(tmp_path / "collector.sock")) as collector:
+            with SocketExporter(collector.address, bar_id=1) as exporter:
+                with ProgressBar(total=10, file=io.StringIO(), exporter=exporter) as p:
+                    p.update(10)
+            assert _wait_for(lambda: 1 in collector.bars and collector.bars[1].closed)
+            assert collector.bars[1].n == 10
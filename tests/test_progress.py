@@ -1,10 +1,14 @@
 import io
+import threading
+import time
 
 import numpy as np
 import pytest
-from numba import njit, prange
+from numba import njit, prange, typed, types, typeof
+from numba.core.errors import TypingError
 
-from numba_progress import ProgressBar, ProgressBarType, __version__
+from numba_progress import ProgressBar, ProgressBarType, FloatProgressBarType, monotonic, monotonic_ns, \
+    tracked_range, tracked, tracked_chunks, __version__
 
 
 # ---- Helpers (numba-compiled) ----
@@ -39,6 +43,94 @@ def _numba_signature(n, progress):
         progress.update(1)
 
 
+@njit(nogil=True, parallel=True)
+def _numba_parallel_work(progress, n, work):
+    for i in prange(n):
+        progress.update(work)
+
+
+@njit(nogil=True)
+def _numba_clock():
+    return monotonic(), monotonic_ns()
+
+
+@njit(nogil=True)
+def _numba_tracked_range(progress, n, stride):
+    total = 0
+    for i in tracked_range(n, progress, stride):
+        total += i
+    return total
+
+
+@njit(nogil=True)
+def _numba_update_per_iteration(progress, values):
+    total = 0.0
+    for i in range(values.shape[0]):
+        total += values[i]
+        progress.update(1)
+    return total
+
+
+@njit(nogil=True)
+def _numba_tracked_range_sum(progress, values, stride):
+    total = 0.0
+    for i in tracked_range(values.shape[0], progress, stride):
+        total += values[i]
+    return total
+
+
+@njit(nogil=True)
+def _numba_tracked(progress, iterable, stride):
+    total = 0
+    for item in tracked(iterable, progress, stride):
+        total += item
+    return total
+
+
+@njit(nogil=True)
+def _numba_tracked_dict(progress, d, stride):
+    total = 0
+    for key in tracked(d, progress, stride):
+        total += key
+    for key in tracked(d.keys(), progress, stride):
+        total += key
+    for value in tracked(d.values(), progress, stride):
+        total += value
+    for key, value in tracked(d.items(), progress, stride):
+        total += key + value
+    return total
+
+
+@njit(nogil=True)
+def _numba_tracked_range_seen(progress, n, stride):
+    seen = np.empty(n, dtype=np.uint64)
+    for i in tracked_range(n, progress, stride):
+        seen[i] = progress.n
+    return seen
+
+
+@njit(nogil=True)
+def _numba_tracked_range_break(progress, n, stride, last):
+    for i in tracked_range(n, progress, stride):
+        if i == last:
+            break
+
+
+@njit(nogil=True)
+def _numba_tracked_chunks_break(progress, array, chunk, last):
+    for block in tracked_chunks(array, chunk, progress):
+        if block[0] == last:
+            break
+
+
+@njit(nogil=True)
+def _numba_tracked_chunks(progress, array, chunk):
+    total = 0.0
+    for block in tracked_chunks(array, chunk, progress):
+        total += block.sum()
+    return total
+
+
 # ---- Version ----
 
 def test_version_exists():
@@ -167,6 +259,42 @@ class TestNumbaIntegration:
         assert p.hook[0] == 5
 
 
+# ---- Work units and clock ----
+
+class TestWorkUnits:
+
+    def test_float_counter_dtype(self):
+        with ProgressBar(total=1.0, file=io.StringIO(), dtype=np.float64) as p:
+            p.update(0.25)
+            p.update(0.5)
+        assert p.hook.dtype == np.float64
+        assert p.n == pytest.approx(0.75)
+
+    def test_unsupported_dtype(self):
+        with pytest.raises(ValueError):
+            ProgressBar(total=10, file=io.StringIO(), dtype=np.int32)
+
+    def test_float_counter_numba_type(self):
+        with ProgressBar(total=1.0, file=io.StringIO(), dtype=np.float64) as p:
+            assert typeof(p) == FloatProgressBarType
+        with ProgressBar(total=1, file=io.StringIO()) as p:
+            assert typeof(p) == ProgressBarType
+
+    def test_float_counter_parallel_update(self):
+        n = 1000
+        p = ProgressBar(total=n * 1.5, file=io.StringIO(), dtype=np.float64)
+        _numba_parallel_work(p, n, 1.5)
+        p.close()
+        assert p.n == pytest.approx(n * 1.5)
+
+    def test_numba_clock_matches_python_clock(self):
+        before = time.monotonic_ns()
+        seconds, nanoseconds = _numba_clock()
+        after = time.monotonic_ns()
+        assert before <= nanoseconds <= after
+        assert before / 1e9 <= seconds <= after / 1e9
+
+
 # ---- Tqdm output correctness ----
 
 class TestTqdmOutput:
@@ -206,3 +334,188 @@ class TestTqdmOutput:
         _numba_parallel(p, n)
         p.close()
         assert "100%" in buf.getvalue()
+
+
+# ---- Callbacks ----
+
+class TestCallbacks:
+
+    def test_callback_receives_updates(self):
+        calls = []
+        with ProgressBar(total=10, file=io.StringIO(), update_interval=0.01,
+                         callbacks=[lambda n, delta, elapsed: calls.append((n, delta, elapsed))]) as p:
+            _numba_sequential(p, 10)
+        assert calls[-1][0] == 10
+        assert sum(delta for _, delta, _ in calls) == 10
+        assert all(elapsed >= 0 for _, _, elapsed in calls)
+
+    def test_render_disabled(self):
+        buf = io.StringIO()
+        calls = []
+        with ProgressBar(total=10, file=buf, render=False,
+                         callbacks=[lambda n, delta, elapsed: calls.append(n)]) as p:
+            p.update(10)
+        assert buf.getvalue() == ""
+        assert calls[-1] == 10
+
+    def test_callback_interval_throttles(self):
+        calls = []
+        with ProgressBar(total=10, file=io.StringIO(), update_interval=0.005,
+                         callbacks=[(lambda n, delta, elapsed: calls.append(n), 10.0)]) as p:
+            for i in range(10):
+                p.update(1)
+                time.sleep(0.01)
+        # one call on the first tick and the final value on close
+        assert len(calls) == 2
+        assert calls[-1] == 10
+
+    def test_slow_callback_is_isolated(self):
+        fast_calls = []
+
+        def slow(n, delta, elapsed):
+            time.sleep(0.5)
+
+        p = ProgressBar(total=100, file=io.StringIO(), update_interval=0.01,
+                        callbacks=[slow, lambda n, delta, elapsed: fast_calls.append(n)])
+        for i in range(10):
+            p.update(1)
+            time.sleep(0.02)
+        assert len(fast_calls) > 1
+        p.close()
+        assert fast_calls[-1] == 10
+
+    def test_hung_callbacks_do_not_block_close(self):
+        release = threading.Event()
+
+        def hung(n, delta, elapsed):
+            release.wait()
+
+        p = ProgressBar(total=10, file=io.StringIO(), close_timeout=0.2, callbacks=[hung, hung, hung])
+        p.update(10)
+        start = time.monotonic()
+        with pytest.warns(RuntimeWarning, match="did not finish"):
+            p.close()
+        # the callbacks are joined against a shared deadline, not one after another
+        assert time.monotonic() - start < 1.0
+        release.set()
+
+    def test_failing_callback_warns(self):
+        def failing(n, delta, elapsed):
+            raise ValueError("boom")
+
+        with pytest.warns(RuntimeWarning, match="boom"):
+            with ProgressBar(total=10, file=io.StringIO(), callbacks=[failing]) as p:
+                p.update(10)
+
+
+# ---- Tracked iteration ----
+
+class TestTrackedIteration:
+
+    @pytest.mark.parametrize("n, stride", [(100, 1), (100, 10), (103, 10), (5, 64), (0, 4), (-3, 2)])
+    def test_tracked_range(self, n, stride):
+        with ProgressBar(total=n, file=io.StringIO()) as p:
+            assert _numba_tracked_range(p, n, stride) == sum(range(n))
+        assert p.n == max(n, 0)
+
+    @pytest.mark.parametrize("stride", [0, -1])
+    def test_invalid_stride(self, stride):
+        with ProgressBar(total=10, file=io.StringIO()) as p:
+            with pytest.raises(ValueError, match="stride must be at least 1"):
+                _numba_tracked_range(p, 10, stride)
+            with pytest.raises(ValueError, match="stride must be at least 1"):
+                _numba_tracked(p, np.arange(10), stride)
+            with pytest.raises(ValueError, match="stride must be at least 1"):
+                tracked_range(10, p, stride)
+        assert p.n == 0
+
+    @pytest.mark.parametrize("chunk", [0, -4])
+    def test_invalid_chunk(self, chunk):
+        with ProgressBar(total=10, file=io.StringIO()) as p:
+            with pytest.raises(ValueError, match="chunk must be at least 1"):
+                _numba_tracked_chunks(p, np.ones(10), chunk)
+            with pytest.raises(ValueError, match="chunk must be at least 1"):
+                tracked_chunks(np.ones(10), chunk, p)
+        assert p.n == 0
+
+    def test_python_fallback(self):
+        with ProgressBar(total=30, file=io.StringIO()) as p:
+            assert sum(tracked_range(10, p, 3)) == 45
+            assert sum(tracked([1, 2, 3], p)) == 6
+            assert sum(len(block) for block in tracked_chunks(np.ones(17), 5, p)) == 17
+        assert p.n == 30
+
+    def test_not_slower_than_per_iteration_update(self):
+        values = np.ones(2_000_000)
+
+        def best_of(function, *args):
+            function(*args)  # compile
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                function(*args)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        with ProgressBar(file=io.StringIO(), render=False) as p:
+            per_iteration = best_of(_numba_update_per_iteration, p, values)
+            batched = best_of(_numba_tracked_range_sum, p, values, 1024)
+        assert batched <= per_iteration
+
+    def test_tracked_range_batches_updates(self):
+        with ProgressBar(total=25, file=io.StringIO()) as p:
+            seen = _numba_tracked_range_seen(p, 25, 10)
+        assert list(seen) == [0] * 10 + [10] * 10 + [20] * 5
+        assert p.n == 25
+
+    def test_tracked_typed_list(self):
+        values = typed.List(range(50))
+        with ProgressBar(total=50, file=io.StringIO()) as p:
+            assert _numba_tracked(p, values, 8) == sum(range(50))
+        assert p.n == 50
+
+    def test_tracked_array(self):
+        values = np.arange(20)
+        with ProgressBar(total=20, file=io.StringIO()) as p:
+            assert _numba_tracked(p, values, 3) == values.sum()
+        assert p.n == 20
+
+    @pytest.mark.parametrize("stride", [1, 3, 64])
+    def test_tracked_typed_dict(self, stride):
+        d = typed.Dict.empty(types.int64, types.int64)
+        for i in range(10):
+            d[i] = 2 * i
+        with ProgressBar(total=40, file=io.StringIO()) as p:
+            # keys, keys(), values() and items()
+            assert _numba_tracked_dict(p, d, stride) == 45 + 45 + 90 + 135
+        assert p.n == 40
+
+    def test_tracked_not_iterable(self):
+        with ProgressBar(total=10, file=io.StringIO()) as p:
+            with pytest.raises(TypingError):
+                _numba_tracked(p, 10, 1)
+
+    @pytest.mark.parametrize("dtype", [np.uint64, np.float64])
+    def test_counter_dtypes(self, dtype):
+        with ProgressBar(total=60, file=io.StringIO(), dtype=dtype) as p:
+            assert _numba_tracked_range(p, 20, 3) == sum(range(20))
+            assert _numba_tracked(p, np.arange(20), 7) == sum(range(20))
+            assert _numba_tracked_chunks(p, np.ones(20), 6) == 20.0
+        assert p.hook.dtype == dtype
+        assert p.n == 60
+
+    def test_break_does_not_report_the_remainder(self):
+        # unlike tqdm, the elements consumed since the last update are not reported when leaving the loop early
+        with ProgressBar(total=100, file=io.StringIO()) as p:
+            _numba_tracked_range_break(p, 100, 10, 14)
+        assert p.n == 10
+        with ProgressBar(total=100, file=io.StringIO()) as p:
+            _numba_tracked_chunks_break(p, np.arange(100), 10, 30)
+        assert p.n == 30
+
+    @pytest.mark.parametrize("chunk", [1, 7, 10, 64])
+    def test_tracked_chunks(self, chunk):
+        array = np.ones((50, 3))
+        with ProgressBar(total=50, file=io.StringIO()) as p:
+            assert _numba_tracked_chunks(p, array, chunk) == 150.0
+        assert p.n == 50